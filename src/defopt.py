@@ -20,20 +20,16 @@ from argparse import (
     REMAINDER, SUPPRESS,
     Action, ArgumentParser, RawTextHelpFormatter,
     ArgumentError, ArgumentTypeError)
-from collections import defaultdict, namedtuple, Counter
+from collections import defaultdict, namedtuple
 from enum import Enum
 from pathlib import PurePath
-from types import MethodType
+from types import MappingProxyType, MethodType
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 try:
     import importlib.metadata as _im
 except ImportError:
     import importlib_metadata as _im
-try:
-    from pkgutil import resolve_name as _pkgutil_resolve_name
-except ImportError:
-    from pkgutil_resolve_name import resolve_name as _pkgutil_resolve_name
 try:
     from typing import Literal
 except ImportError:
@@ -45,23 +41,35 @@ except ImportError:
     _ti_get_args = _ti.get_args
     _ti_get_origin = _ti.get_origin
 
-import docutils.core
-from docutils.nodes import NodeVisitor, SkipNode, TextElement
-from docutils.parsers.rst.states import Body
 
-try:
-    collections.Callable = collections.abc.Callable
-    from sphinxcontrib.napoleon import Config, GoogleDocstring, NumpyDocstring
-finally:
-    del collections.Callable
+# docutils, sphinxcontrib.napoleon and colorama are slow to import, so they are
+# only imported when first needed (docutils and napoleon only if a docstring
+# actually needs to be parsed).
+
+
+@functools.lru_cache()
+def _get_colorama_text():
+    try:
+        # colorama is a dependency on Windows to support ANSI escapes (from rst
+        # markup).  It is optional on Unices, but can still be useful there as
+        # it strips out ANSI escapes when the output is piped.
+        from colorama import colorama_text
+    except ImportError:
+        # nullcontext is stateless, so a single instance can be reused.
+        null_context = contextlib.nullcontext()
+        colorama_text = lambda: null_context
+    return colorama_text
+
+
+@functools.lru_cache()
+def _get_napoleon():
+    try:
+        collections.Callable = collections.abc.Callable
+        from sphinxcontrib import napoleon
+    finally:
+        del collections.Callable
+    return napoleon
 
-try:
-    # colorama is a dependency on Windows to support ANSI escapes (from rst
-    # markup).  It is optional on Unices, but can still be useful there as it
-    # strips out ANSI escapes when the output is piped.
-    from colorama import colorama_text as _colorama_text
-except ImportError:
-    _colorama_text = getattr(contextlib, 'nullcontext', contextlib.ExitStack)
 
 try:
     __version__ = _im.version('defopt')
@@ -72,12 +80,46 @@ __all__ = ['run', 'signature', 'bind', 'bind_known']
 
 _PARAM_TYPES = ['param', 'parameter', 'arg', 'argument', 'key', 'keyword']
 _TYPE_NAMES = ['type', 'kwtype']
-_LIST_TYPES = [
+# Docstring field names -> the kind of information they hold.
+_FIELD_DOCTYPES = {
+    **dict.fromkeys(_PARAM_TYPES, 'param'),
+    **dict.fromkeys(_TYPE_NAMES, 'type'),
+    'raises': 'raises',
+}
+# Only matches what ast.parse would also parse as int literals (in particular,
+# no leading zeros); anything else goes through the ast-based slow path.
+_SIMPLE_SLICE_RE = re.compile(
+    r' *(-?(?:0|[1-9][0-9]*))? *: *(-?(?:0|[1-9][0-9]*))? *'
+    r'(?:: *(-?(?:0|[1-9][0-9]*))? *)?')
+# Docstrings made only of unindented lines of words, none of which can be RST
+# markup: the first word of each line starts with a letter and doesn't end
+# with "." or ")" (which could make it an enumerator), and there are no markup
+# characters (*`_|:[]<>\ etc.) at all.
+_PLAIN_DOCSTRING_RE = re.compile(
+    r"[A-Za-z][A-Za-z0-9,;!?'\"(%/-]*(?: +[A-Za-z0-9,.;!?'\"()%/-]+)*"
+    r"(?:\n(?:[A-Za-z][A-Za-z0-9,;!?'\"(%/-]*"
+    r"(?: +[A-Za-z0-9,.;!?'\"()%/-]+)*)?)*")
+_PARAGRAPH_SEP_RE = re.compile('\n{2,}')
+# Single-line info fields (":param int x: The x.") without markup either: words
+# are made of the above characters (plus brackets, for types), underscores are
+# only allowed before an alphanumeric (so that nothing can be a reference), and
+# the body's first word obeys the same rules as above.
+_PLAIN_FIELD_RE = re.compile(
+    r":([a-z]+)((?: [A-Za-z](?:[A-Za-z0-9.,\[\]]|_(?=[A-Za-z0-9]))*){0,2}): "
+    r"([A-Za-z](?:[A-Za-z0-9,;!?'\"(%/\[\]-]|_(?=[A-Za-z0-9]))*"
+    r"(?: (?:[A-Za-z0-9,.;!?'\"()%/\[\]-]|_(?=[A-Za-z0-9]))+)*)")
+_BOOL_STRINGS = {
+    't': True, 'true': True, '1': True,
+    'f': False, 'false': False, '0': False,
+}
+_LIST_TYPES = frozenset([
     list,
     collections.abc.Iterable,
     collections.abc.Collection,
     collections.abc.Sequence,
-]
+])
+_CONTAINER_TYPES = _LIST_TYPES | {tuple}
+_UNION_TYPES = frozenset([Union, getattr(types, 'UnionType', Union)])  # X | Y
 
 
 class _BooleanOptionalAction(Action):
@@ -111,7 +153,7 @@ class _BooleanOptionalAction(Action):
         return ' | '.join(self.option_strings)
 
 
-class _PseudoChoices(list):
+class _PseudoChoices(tuple):
     """
     Pseudo-type used for ``add_argument(..., choices=...)`` so that usage
     strings correctly print choices (as their corresponding str values) for
@@ -123,9 +165,10 @@ class _PseudoChoices(list):
     (see `argparse._get_action_name`).
     """
 
-    def __init__(self, items):
-        super().__init__(str(item.name if isinstance(item, Enum) else item)
-                         for item in items)
+    def __new__(cls, items):
+        return super().__new__(
+            cls, [str(item.name if isinstance(item, Enum) else item)
+                  for item in items])
 
     def __contains__(self, obj):
         return True
@@ -149,7 +192,7 @@ def _bind_or_bind_known(funcs, *, opts, _known: bool = False):
     _check_in_list(['kwonly', 'all', 'has_default'],
                    cli_options=opts.cli_options)
     parser = _create_parser(funcs, opts)
-    with _colorama_text():
+    with _get_colorama_text()():
         if not opts.intermixed:
             if not _known:
                 args, rest = parser.parse_args(opts.argv), []
@@ -317,12 +360,13 @@ _DefoptOptions = namedtuple(
     ['parsers', 'short', 'cli_options', 'show_defaults', 'show_types',
      'no_negated_flags', 'version', 'argparse_kwargs', 'intermixed', 'argv'])
 
+_DEFAULT_OPTIONS = _DefoptOptions(**{
+    k: param.default for k, param in inspect.signature(run).parameters.items()
+    if k in _DefoptOptions._fields})
+
 
 def _options(**kwargs):
-    params = inspect.signature(run).parameters
-    return (
-        _DefoptOptions(*[params[k].default for k in _DefoptOptions._fields])
-        ._replace(**kwargs))
+    return _DEFAULT_OPTIONS._replace(**kwargs)
 
 
 def _recurse_functions(funcs, subparsers):
@@ -342,7 +386,8 @@ def _recurse_functions(funcs, subparsers):
         if callable(func):
             # If this item is callable, then add it to the current
             # subparser using this name.
-            sp_help = signature(inspect.getdoc(func)).doc.split('\n\n', 1)[0]
+            # signature(func) is cached and reused by _populate_parser.
+            sp_help = signature(func).doc.split('\n\n', 1)[0]
             subparser = subparsers.add_parser(
                 name, formatter_class=RawTextHelpFormatter, help=sp_help)
             yield func, subparser
@@ -396,9 +441,20 @@ def _get_version1(func):
             module_name = f_globals['__spec__'].name
         else:
             return f_globals.get('__version__')
+    return _get_module_version(module_name)
+
+
+@functools.lru_cache()
+def _get_module_version(module_name):
+    # Subcommands typically all live in the same package, so the walk up the
+    # package hierarchy is cached per module name.
     while True:
+        # The module is nearly always already imported (e.g. when calling
+        # `run(func)` from that module), so skip the import machinery.
+        module = (sys.modules.get(module_name)
+                  or importlib.import_module(module_name))
         try:
-            return importlib.import_module(module_name).__version__
+            return module.__version__
         except AttributeError:
             if '.' not in module_name:
                 return
@@ -467,8 +523,12 @@ def signature(func: Union[Callable, str]):
     else:
         inspect_sig = _preprocess_inspect_signature(
             func, inspect.signature(func))
-        doc_sig = _preprocess_doc_signature(
-            func, signature(inspect.getdoc(func)))
+        doc = inspect.getdoc(func)
+        if doc is None:  # Nothing to merge.
+            return Signature(
+                inspect_sig.parameters.values(),
+                return_annotation=inspect_sig.return_annotation, doc='')
+        doc_sig = _preprocess_doc_signature(func, signature(doc))
         return _merge_signatures(inspect_sig, doc_sig)
 
 
@@ -553,36 +613,52 @@ def _get_type_from_doc(name, globalns):
         return Union[tuple(subtype for subtype in subtypes)]
     if sys.version_info < (3, 9):  # Support "list[type]", "tuple[type]".
         globalns = {**globalns, 'tuple': Tuple, 'list': List}
+    if name.isidentifier() and name in globalns:  # Skip compiling the name.
+        return _get_type_from_hint(globalns[name])
     return _get_type_from_hint(eval(name, globalns))
 
 
 def _get_type_from_hint(hint):
+    if type(hint) is type:  # Plain classes (the common case) have no origin.
+        return hint
     if _is_list_like(hint):
         [type_] = _ti_get_args(hint)
         return List[type_]
     return hint
 
 
+@functools.lru_cache()
+def _default_short(names, positionals, add_help):
+    # Subcommands often share parameter lists, so cache the (read-only)
+    # mapping of dashed names to non-ambiguous initials.
+    seen = {'h'} if add_help else set()
+    duplicated = set()
+    for name in names:
+        if name not in positionals:
+            (duplicated if name[0] in seen else seen).add(name[0])
+    return MappingProxyType({
+        name.replace('_', '-'): name[0] for name in names
+        if name not in positionals and name[0] not in duplicated})
+
+
 def _populate_parser(func, parser, opts):
     sig = signature(func)
     parser.description = sig.doc
 
+    kwonly_mode = opts.cli_options == 'kwonly'
+    has_default_mode = opts.cli_options == 'has_default'
     positionals = {
         name for name, param in sig.parameters.items()
-        if ((opts.cli_options == 'kwonly' or
-             (param.default is param.empty
-              and opts.cli_options == 'has_default'))
+        if ((kwonly_mode or
+             (has_default_mode and param.default is param.empty))
             and not _is_list_like(param.annotation)
             and not _is_optional_list_like(param.annotation)
             and param.kind != param.KEYWORD_ONLY)}
+    dashed_names = {name: name.replace('_', '-') for name in sig.parameters}
+    prefix_char = parser.prefix_chars[0]
     if opts.short is None:
-        count_initials = Counter(name[0] for name in sig.parameters
-                                 if name not in positionals)
-        if parser.add_help:
-            count_initials['h'] += 1
-        opts = opts._replace(short={
-            name.replace('_', '-'): name[0] for name in sig.parameters
-            if name not in positionals and count_initials[name[0]] == 1})
+        opts = opts._replace(short=_default_short(
+            tuple(sig.parameters), frozenset(positionals), parser.add_help))
 
     actions = []
     for name, param in sig.parameters.items():
@@ -603,7 +679,8 @@ def _populate_parser(func, parser, opts):
                       if opts.no_negated_flags and default in [False, None]
                       else _BooleanOptionalAction)  # --name/--no-name
             actions.append(_add_argument(
-                parser, name, opts.short, action=action, default=default,
+                parser, name, dashed_names[name], opts.short, prefix_char,
+                action=action, default=default,
                 required=required,  # Always False if `default is False`.
                 **kwargs))  # Add help if available.
             continue
@@ -636,7 +713,6 @@ def _populate_parser(func, parser, opts):
             if param.kind == param.VAR_POSITIONAL:
                 kwargs['action'] = 'append'
                 kwargs['default'] = _DefaultList()
-        member_types = None
 
         if isinstance(type_, type) and issubclass(type_, Enum):
             # Enums must be checked first to handle enums-of-namedtuples.
@@ -650,12 +726,15 @@ def _populate_parser(func, parser, opts):
             if num_members == 2 and member_types[1] is Ellipsis:
                 kwargs['nargs'] = '*'
                 kwargs['action'] = _make_store_tuple_action_class(
-                    tuple, member_types, opts.parsers, is_variable_length=True)
+                    tuple, [_get_parser(member_types[0], opts.parsers)],
+                    is_variable_length=True)
             elif type(None) in union_args and opts.parsers.get(type(None)):
                 if num_members == 1:
                     kwargs['nargs'] = 1
                     kwargs['action'] = _make_store_tuple_action_class(
-                        tuple, member_types, opts.parsers,
+                        tuple,
+                        [_get_parser(arg, opts.parsers)
+                         for arg in member_types],
                         with_none_parser=opts.parsers[type(None)])
                 else:
                     raise ValueError(
@@ -664,7 +743,8 @@ def _populate_parser(func, parser, opts):
             else:
                 kwargs['nargs'] = num_members
                 kwargs['action'] = _make_store_tuple_action_class(
-                    tuple, member_types, opts.parsers)
+                    tuple,
+                    [_get_parser(arg, opts.parsers) for arg in member_types])
         elif (isinstance(type_, type) and issubclass(type_, tuple)
               and hasattr(type_, '_fields')):
             # Before Py3.6, `_field_types` does not preserve order, so retrieve
@@ -673,32 +753,36 @@ def _populate_parser(func, parser, opts):
             member_types = tuple(hints[field] for field in type_._fields)
             kwargs['nargs'] = len(member_types)
             kwargs['action'] = _make_store_tuple_action_class(
-                type_, member_types, opts.parsers)
+                type_,
+                [_get_parser(arg, opts.parsers) for arg in member_types])
             if not positional:  # http://bugs.python.org/issue14074
                 kwargs['metavar'] = type_._fields
         else:
             kwargs['type'] = _get_parser(type_, opts.parsers)
             if _ti_get_origin(type_) is Literal:
                 kwargs['choices'] = _PseudoChoices(_ti_get_args(type_))
-        actions.append(_add_argument(parser, name, opts.short, **kwargs))
+        actions.append(_add_argument(
+            parser, name, dashed_names[name], opts.short, prefix_char,
+            **kwargs))
     for action in actions:
         _update_help_string(action, opts)
 
     parser.set_defaults(_func=func)
 
 
-def _add_argument(parser, name, short, _positional=False, **kwargs):
+def _add_argument(
+    parser, name, dashed_name, short, prefix_char, _positional=False,
+    **kwargs,
+):
     negative_option_strings = []
     if _positional:
         args = [name]
     else:
-        prefix_char = parser.prefix_chars[0]
-        name = name.replace('_', '-')
-        args = [prefix_char * 2 + name]
-        if name in short:
-            args.insert(0, prefix_char + short[name])
+        args = [prefix_char * 2 + dashed_name]
+        if dashed_name in short:
+            args.insert(0, prefix_char + short[dashed_name])
         if kwargs.get('action') == _BooleanOptionalAction:
-            no_name = 'no-' + name
+            no_name = 'no-' + dashed_name
             if no_name in short:
                 args.append(prefix_char + short[no_name])
                 negative_option_strings.append(args[-1])
@@ -713,10 +797,15 @@ def _add_argument(parser, name, short, _positional=False, **kwargs):
 def _update_help_string(action, opts):
     action_help = action.help or ''
     info = []
+    # defopt's enum and literal parsers are closures tagged with private
+    # attributes; other parsers may be user types, whose own attributes must
+    # not be mistaken for these tags.
+    tagged = None if isinstance(action.type, type) else action.type
+    enum = getattr(tagged, '_defopt_enum', None)
     if (opts.show_types
             and action.type is not None
-            and action.type.func not in [_make_enum_parser,
-                                         _make_literal_parser]
+            and enum is None
+            and not hasattr(tagged, '_defopt_literal')
             and '%(type)' not in action_help):
         info.append('type: %(type)s')
     if (opts.show_defaults
@@ -726,9 +815,7 @@ def _update_help_string(action, opts):
             and action.default is not SUPPRESS):
         info.append(
             'default: {}'.format(action.default.name.replace('%', '%%'))
-            if action.type is not None
-               and action.type.func is _make_enum_parser
-               and isinstance(action.default, action.type.args)
+            if enum is not None and isinstance(action.default, enum)
             else 'default: %(default)s')
     parts = [action.help, '({})'.format(', '.join(info)) if info else '']
     action.help = '\n'.join(filter(None, parts)) or ''
@@ -739,11 +826,11 @@ def _is_list_like(type_):
 
 
 def _is_container(type_):
-    return _ti_get_origin(type_) in {*_LIST_TYPES, tuple}
+    return _ti_get_origin(type_) in _CONTAINER_TYPES
 
 
 def _is_union_type(type_):
-    return _ti_get_origin(type_) in {Union, getattr(types, 'UnionType', '')}
+    return _ti_get_origin(type_) in _UNION_TYPES
 
 
 def _is_optional_list_like(type_):
@@ -756,82 +843,173 @@ def _is_optional_list_like(type_):
 def _passthrough_role(
     name, rawtext, text, lineno, inliner, options={}, content=[],
 ):
+    from docutils.nodes import TextElement
     return [TextElement(rawtext, text)], []
 
 
+# Standard roles:
+# https://www.sphinx-doc.org/en/master/usage/restructuredtext/roles.html
+# Python-domain roles:
+# https://www.sphinx-doc.org/en/master/usage/restructuredtext/domains.html
+_SPHINX_ROLES = [
+    'abbr',
+    'command',
+    'dfn',
+    'file',
+    'guilabel',
+    'kbd',
+    'mailheader',
+    'makevar',
+    'manpage',
+    'menuselection',
+    'mimetype',
+    'newsgroup',
+    'program',
+    'regexp',
+    'samp',
+    'pep',
+    'rfc',
+    'py:mod',
+    'py:func',
+    'py:data',
+    'py:const',
+    'py:class',
+    'py:meth',
+    'py:attr',
+    'py:exc',
+    'py:obj'
+]
+# Each role is also accessible without its domain prefix ("func" for
+# "py:func"); compute all the names once.
+_SPHINX_ROLE_NAMES = {
+    role.split(':', i)[-1]: _passthrough_role
+    for role in _SPHINX_ROLES for i in range(role.count(':') + 1)}
+
+
 @contextlib.contextmanager
 def _sphinx_common_roles():
-    # Standard roles:
-    # https://www.sphinx-doc.org/en/master/usage/restructuredtext/roles.html
-    # Python-domain roles:
-    # https://www.sphinx-doc.org/en/master/usage/restructuredtext/domains.html
-    roles = [
-        'abbr',
-        'command',
-        'dfn',
-        'file',
-        'guilabel',
-        'kbd',
-        'mailheader',
-        'makevar',
-        'manpage',
-        'menuselection',
-        'mimetype',
-        'newsgroup',
-        'program',
-        'regexp',
-        'samp',
-        'pep',
-        'rfc',
-        'py:mod',
-        'py:func',
-        'py:data',
-        'py:const',
-        'py:class',
-        'py:meth',
-        'py:attr',
-        'py:exc',
-        'py:obj'
-    ]
+    from docutils.parsers.rst import roles as docutils_roles
     # No public unregistration API :(  Also done by sphinx.
-    role_map = docutils.parsers.rst.roles._roles
-    for role in roles:
-        for i in range(role.count(':') + 1):
-            role_map[role.split(':', i)[-1]] = _passthrough_role
+    role_map = docutils_roles._roles
+    role_map.update(_SPHINX_ROLE_NAMES)
     try:
         yield
     finally:
-        for role in roles:
-            for i in range(role.count(':') + 1):
-                role_map.pop(role.split(':', i)[-1])
+        for name in _SPHINX_ROLE_NAMES:
+            role_map.pop(name)
 
 
-def _parse_docstring(doc):
+@functools.lru_cache()
+def _get_napoleon_config():
+    # use_ivar avoids generating an unhandled .. attribute:: directive for
+    # Attribute blocks, preferring a benign :ivar: field.
+    return _get_napoleon().Config(napoleon_use_ivar=True)
+
+
+@functools.lru_cache()
+def _get_docutils_settings():
+    # Setting up the settings (which involves building an OptionParser from
+    # all components' specs, and reading config files) costs more than parsing
+    # a typical docstring, so do it once and share the result.
+    from docutils.core import Publisher
+    from docutils.parsers.rst import Parser
+    from docutils.readers.standalone import Reader
+    from docutils.writers.null import Writer
+    parser = Parser()
+    publisher = Publisher(Reader(parser), parser, Writer())
+    publisher.process_programmatic_settings(
+        # - Propagate errors out.
+        # - Disable syntax highlighting, as 1) pygments is not a dependency
+        #   2) we don't render with colors and 3) SH breaks the assumption
+        #   that literal blocks contain a single text element.
+        None, {'halt_level': 3, 'syntax_highlight': 'none'}, None)
+    return publisher.settings
+
+
+def _may_have_napoleon_sections(lines):
+    # Google-style section headers end with a colon; Numpy-style ones are
+    # underlined with (at least two) punctuation characters.  This is a
+    # superset of what napoleon actually recognizes.
+    return any(line.rstrip().endswith(':')
+               or line[:2] and all(c in '=-`:\'"~^_*+#<>' for c in line[:2])
+               for line in lines)
+
+
+def _add_field(field_name, params, raises):
     """
-    Extract documentation from a function's docstring into a `.Signature`
-    object *with unevaluated annotations*.
+    Record the info field named *field_name* (e.g. "param int x") into *params*
+    and *raises*.
+
+    Return ``(param, doctype)`` if the field's body should be stored as
+    ``param[doctype]``, or None if the field is not rendered.
+    """
+    parts = field_name.split()
+    if len(parts) == 2:
+        doctype, name = parts
+    elif len(parts) == 3:
+        doctype, type_, name = parts
+    else:
+        return None
+    doctype = _FIELD_DOCTYPES.get(doctype)
+    if doctype is None or len(parts) == 3 and doctype != 'param':
+        return None
+    # docutils>=0.16 represents \* as \0* in the doctree.
+    name = name.lstrip('*\0')
+    if doctype == 'raises':
+        raises.append(name)
+        return None
+    param = params[name]
+    if len(parts) == 3:
+        if 'type' in param:
+            raise ValueError(f'type defined twice for {name}')
+        param['type'] = type_
+    if doctype in param:
+        raise ValueError(f'{doctype} defined twice for {name}')
+    return param, doctype
+
+
+def _parse_plain_fields(doc):
     """
+    Parse a docstring made of plain prose followed by a list of plain info
+    fields (see `_PLAIN_DOCSTRING_RE` and `_PLAIN_FIELD_RE`) without going
+    through docutils, mimicking the docstring visitor's output.
 
-    if doc is None:
-        return Signature(doc='')
+    Return ``(paragraphs, params, raises)``, or None if *doc* does not have
+    that form.
+    """
+    if doc.startswith(':'):
+        prose, fields = '', doc
+    else:
+        idx = doc.find('\n\n:')
+        if idx == -1:
+            return None
+        prose, fields = doc[:idx].rstrip('\n'), doc[idx + 2:]
+        if not _PLAIN_DOCSTRING_RE.fullmatch(prose):
+            return None
+    matches = [_PLAIN_FIELD_RE.fullmatch(line)
+               for line in fields.split('\n') if line]
+    if not all(matches):
+        return None
+    params = defaultdict(dict)
+    raises = []
+    for match in matches:
+        doctype, names, body = match.groups()
+        field = _add_field(doctype + names, params, raises)
+        if field is not None:
+            param, doctype = field
+            param[doctype] = body
+    paragraphs = _PARAGRAPH_SEP_RE.split(prose) if prose else []
+    return paragraphs, params, raises
 
-    # Convert Google- or Numpy-style docstrings to RST.
-    # (Should do nothing if not in either style.)
-    # use_ivar avoids generating an unhandled .. attribute:: directive for
-    # Attribute blocks, preferring a benign :ivar: field.
-    doc = inspect.cleandoc(doc)
-    cfg = Config(napoleon_use_ivar=True)
-    doc = str(GoogleDocstring(doc, cfg))
-    doc = str(NumpyDocstring(doc, cfg))
 
-    with _sphinx_common_roles():
-        tree = docutils.core.publish_doctree(
-            # - Propagate errors out.
-            # - Disable syntax highlighting, as 1) pygments is not a dependency
-            #   2) we don't render with colors and 3) SH breaks the assumption
-            #   that literal blocks contain a single text element.
-            doc, settings_overrides={
-                'halt_level': 3, 'syntax_highlight': 'none'})
+@functools.lru_cache()
+def _get_docstring_visitor_class():
+    # Defined on first use (and only once), as docutils is imported lazily.
+    from docutils.nodes import NodeVisitor, SkipNode
+    from docutils.parsers.rst.states import Body
+
+    # make_enumerator doesn't depend on the parser state; share one instance.
+    make_enumerator = Body(None).make_enumerator
 
     class Visitor(NodeVisitor):
         optional = [
@@ -843,10 +1021,51 @@ def _parse_docstring(doc):
             'TextElement',
         ]
 
+        # Node type -> unbound visit/depart method.  NodeVisitor looks these
+        # up with a getattr on a computed name (and logs a debug message) for
+        # every single node.
+        _visit_methods = {}
+        _depart_methods = {}
+
+        def dispatch_visit(self, node):
+            cls = type(node)
+            try:
+                method = self._visit_methods[cls]
+            except KeyError:
+                method = self._visit_methods[cls] = getattr(
+                    Visitor, f'visit_{cls.__name__}', Visitor.unknown_visit)
+            return method(self, node)
+
+        def dispatch_departure(self, node):
+            cls = type(node)
+            try:
+                method = self._depart_methods[cls]
+            except KeyError:
+                method = self._depart_methods[cls] = getattr(
+                    Visitor, f'depart_{cls.__name__}',
+                    Visitor.unknown_departure)
+            return method(self, node)
+
+        def walk(self, node):
+            # Iterative equivalent of node.walkabout(self), avoiding a few
+            # Python frames and a reporter.debug call per node.  Only SkipNode
+            # is used by this visitor, so other exceptions need no handling.
+            stack = [(node, False)]
+            while stack:
+                node, departing = stack.pop()
+                if departing:
+                    self.dispatch_departure(node)
+                    continue
+                try:
+                    self.dispatch_visit(node)
+                except SkipNode:
+                    continue
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children[::-1])
+
         def __init__(self, document):
             super().__init__(document)
             self.paragraphs = []
-            self.start_lines = []
             self.params = defaultdict(dict)
             self.raises = []
             self._current_paragraph = None
@@ -857,15 +1076,16 @@ def _parse_docstring(doc):
             pass
 
         def visit_paragraph(self, node):
-            self.start_lines.append(node.line)
             self._current_paragraph = []
 
         def depart_paragraph(self, node):
             text = ''.join(self._current_paragraph)
-            text = ''.join(self._indent_stack) + text
-            self._indent_stack = [
-                ' ' * len(item) for item in self._indent_stack]
-            text = text.replace('\n', '\n' + ''.join(self._indent_stack))
+            indent = ''.join(self._indent_stack)
+            if indent:  # Only within lists.
+                # Later paragraphs of the same item are indented by spaces.
+                self._indent_stack = [
+                    ' ' * len(item) for item in self._indent_stack]
+                text = indent + text.replace('\n', '\n' + ' ' * len(indent))
             self.paragraphs.append(text)
             self._current_paragraph = None
 
@@ -916,9 +1136,8 @@ def _parse_docstring(doc):
 
         def visit_literal_block(self, node):
             text, = node
-            self.start_lines.append(node.line)
             self.paragraphs.append(
-                re.sub('^|\n', r'\g<0>    ', text))  # indent
+                '    ' + text.replace('\n', '\n    '))  # indent
             raise SkipNode
 
         def visit_bullet_list(self, node):
@@ -934,7 +1153,7 @@ def _parse_docstring(doc):
                    ('', ')'): 'rparen',
                    ('', '.'): 'period'}[node['prefix'], node['suffix']]
             start = node.get('start', 1)
-            enumerators = [Body(None).make_enumerator(i, enumtype, fmt)[0]
+            enumerators = [make_enumerator(i, enumtype, fmt)[0]
                            for i in range(start, start + len(node))]
             width = max(map(len, enumerators))
             enumerators = [enum.ljust(width) for enum in enumerators]
@@ -952,81 +1171,115 @@ def _parse_docstring(doc):
         def visit_field(self, node):
             field_name_node, field_body_node = node
             field_name, = field_name_node
-            parts = field_name.split()
-            if len(parts) == 2:
-                doctype, name = parts
-                # docutils>=0.16 represents \* as \0* in the doctree.
-                name = name.lstrip('*\0')
-            elif len(parts) == 3:
-                doctype, type_, name = parts
-                name = name.lstrip('*\0')
-                if doctype not in _PARAM_TYPES:
-                    raise SkipNode
-                if 'type' in self.params[name]:
-                    raise ValueError(f'type defined twice for {name}')
-                self.params[name]['type'] = type_
-            else:
-                raise SkipNode
-            if doctype in _PARAM_TYPES:
-                doctype = 'param'
-            if doctype in _TYPE_NAMES:
-                doctype = 'type'
-            if doctype in ['param', 'type'] and doctype in self.params[name]:
-                raise ValueError(f'{doctype} defined twice for {name}')
-            visitor = Visitor(self.document)
-            field_body_node.walkabout(visitor)
-            if doctype in ['param', 'type']:
-                self.params[name][doctype] = '\n\n'.join(visitor.paragraphs)
-            elif doctype in ['raises']:
-                self.raises.append(name)
+            # Other fields (e.g. :returns:) are not rendered, so skip them
+            # before walking their bodies.
+            field = _add_field(field_name, self.params, self.raises)
+            if field is not None:
+                param, doctype = field
+                visitor = type(self)(self.document)
+                visitor.walk(field_body_node)
+                param[doctype] = '\n\n'.join(visitor.paragraphs)
             raise SkipNode
 
         def visit_comment(self, node):
-            self.paragraphs.append(comment_token)
-            # Comments report their line as the *end* line of the comment.
-            self.start_lines.append(
-                node.line - node.children[0].count('\n') - 1)
             raise SkipNode
 
-        def visit_system_message(self, node):
-            raise SkipNode
+        visit_system_message = visit_comment
+
+    return Visitor
+
+
+def _parse_docstring(doc):
+    """
+    Extract documentation from a function's docstring into a `.Signature`
+    object *with unevaluated annotations*.
+    """
 
-    comment_token = object()
-    visitor = Visitor(tree)
-    tree.walkabout(visitor)
+    if doc is None:
+        return Signature(doc='')
+
+    doc = inspect.cleandoc(doc)
+    if _PLAIN_DOCSTRING_RE.fullmatch(doc):
+        # Plain prose (by far the most common case): docutils would only
+        # split it into paragraphs.
+        return Signature(doc=''.join(
+            f'{paragraph}\n\n' for paragraph in _PARAGRAPH_SEP_RE.split(doc)))
+
+    parsed = _parse_plain_fields(doc)  # Next most common case.
+    if parsed is None:
+        parsed = _parse_docstring_with_docutils(doc)
+    paragraphs, params, raises = parsed
 
     params = [Parameter(name, kind=Parameter.POSITIONAL_OR_KEYWORD,
                         annotation=values.get('type', Parameter.empty),
                         doc=values.get('param'))
-              for name, values in visitor.params.items()]
+              for name, values in params.items()]
     text = []
-    if visitor.paragraphs:
-        for start, paragraph, next_start in zip(
-                visitor.start_lines,
-                visitor.paragraphs,
-                visitor.start_lines[1:] + [0]):
-            if paragraph is comment_token:
-                continue
-            text.append(paragraph)
-            # Insert two newlines to separate paragraphs by a blank line.
-            # Actually, paragraphs may or may not already have a trailing
-            # newline (e.g. text paragraphs do but literal blocks don't) but
-            # argparse will strip extra newlines anyways.  This means that
-            # extra blank lines in the original docstring will be stripped, but
-            # this is less ugly than having a large number of extra blank lines
-            # arising e.g. from skipped info fields (which are not rendered).
-            # This means that list items are always separated by blank lines,
-            # which is an acceptable tradeoff for now.
-            text.append('\n\n')
-    return Signature(params, doc=''.join(text), raises=visitor.raises)
+    for paragraph in paragraphs:
+        text.append(paragraph)
+        # Insert two newlines to separate paragraphs by a blank line.
+        # Actually, paragraphs may or may not already have a trailing
+        # newline (e.g. text paragraphs do but literal blocks don't) but
+        # argparse will strip extra newlines anyways.  This means that
+        # extra blank lines in the original docstring will be stripped, but
+        # this is less ugly than having a large number of extra blank lines
+        # arising e.g. from skipped info fields (which are not rendered).
+        # This means that list items are always separated by blank lines,
+        # which is an acceptable tradeoff for now.
+        text.append('\n\n')
+    return Signature(params, doc=''.join(text), raises=raises)
+
+
+def _parse_docstring_with_docutils(doc):
+    # Convert Google- or Numpy-style docstrings to RST.
+    # (Should do nothing if not in either style.)
+    lines = doc.splitlines()
+    if _may_have_napoleon_sections(lines):
+        napoleon = _get_napoleon()
+        cfg = _get_napoleon_config()
+        doc = str(napoleon.GoogleDocstring(doc, cfg))
+        doc = str(napoleon.NumpyDocstring(doc, cfg))
+    else:  # napoleon would only strip trailing whitespace.
+        doc = '\n'.join(line.rstrip() for line in lines)
+
+    import docutils.core
+    with _sphinx_common_roles():
+        tree = docutils.core.publish_doctree(
+            doc, settings=_get_docutils_settings())
+
+    visitor = _get_docstring_visitor_class()(tree)
+    visitor.walk(tree)
+    return visitor.paragraphs, visitor.params, visitor.raises
 
 
 def _get_parser(type_, parsers):
+    # Parsers only depend on the type and the contents of the (small) parsers
+    # dict, so cache them on these, rather than on the dict's (reusable) id.
+    # Unions and Literals compare equal regardless of the order of their
+    # arguments, but that order matters for parsing (e.g., the first
+    # infaillible member of a Union wins), so also key on their repr.
+    key = (type_, tuple(parsers.items()),
+           None if isinstance(type_, type) else repr(type_))
+    try:
+        hash(key)
+    except TypeError:  # Unhashable type or custom parser.
+        return _get_parser_uncached(type_, parsers)
+    return _get_parser_cached(*key)
+
+
+@functools.lru_cache()
+def _get_parser_cached(type_, parsers_items, type_repr):
+    return _get_parser_uncached(type_, dict(parsers_items))
+
+
+def _get_parser_uncached(type_, parsers):
     if type_ in parsers:  # Not catching KeyError, to avoid exception chaining.
         parser = functools.partial(parsers[type_])
     elif (type_ in [str, int, float]
           or isinstance(type_, type) and issubclass(type_, PurePath)):
-        parser = functools.partial(type_)
+        # The type itself already has the right __name__, and calling it
+        # directly saves a partial() call per parsed value.
+        return type_
     elif type_ == bool:
         parser = functools.partial(_parse_bool)
     elif type_ == slice:
@@ -1038,6 +1291,8 @@ def _get_parser(type_, parsers):
     elif isinstance(type_, type) and issubclass(type_, Enum):
         parser = _make_enum_parser(type_)
     elif _is_constructible_from_str(type_):
+        if isinstance(type_, type):
+            return type_
         parser = functools.partial(type_)
     elif _is_union_type(type_):
         args = _ti_get_args(type_)
@@ -1053,13 +1308,9 @@ def _get_parser(type_, parsers):
         for arg in args:
             elem_parser = _get_parser(arg, parsers)
             elem_parsers.append(elem_parser)
-            if (isinstance(elem_parser, functools.partial)
-                    and (elem_parser.func is str
-                         or isinstance(elem_parser.func, type)
-                         and issubclass(elem_parser.func, PurePath))
-                    and not (elem_parser.args or elem_parser.keywords)):
-                # Infaillible parser; skip all following types (which may not
-                # even have a parser defined).
+            if _is_infaillible_parser(elem_parser):
+                # Skip all following types (which may not even have a parser
+                # defined).
                 break
         parser = _make_union_parser(type_, elem_parsers)
     elif _ti_get_origin(type_) is Literal:
@@ -1070,23 +1321,41 @@ def _get_parser(type_, parsers):
         raise Exception('no parser found for type {}'.format(
             # typing types have no __name__.
             getattr(type_, '__name__', repr(type_))))
-    # Set the name that the user expects to see in error messages (we always
-    # return a temporary partial object so it's safe to set its __name__).
+    # Set the name that the user expects to see in error messages (types are
+    # returned as is above; otherwise, we always create a new partial object
+    # or closure so it's safe to set its __name__).
     # Unions and Literals don't have a __name__, but their str is fine.
     parser.__name__ = getattr(type_, '__name__', str(type_))
     return parser
 
 
+def _unwrap_trivial_partial(parser):
+    # Parsers are either plain callables (e.g. types) or partials thereof.
+    if (isinstance(parser, functools.partial)
+            and not (parser.args or parser.keywords)):
+        return parser.func
+    return parser
+
+
+def _is_infaillible_parser(parser):
+    parser = _unwrap_trivial_partial(parser)
+    return (parser is str
+            or isinstance(parser, type) and issubclass(parser, PurePath))
+
+
 def _parse_bool(string):
-    if string.lower() in ['t', 'true', '1']:
-        return True
-    elif string.lower() in ['f', 'false', '0']:
-        return False
-    else:
-        raise ValueError(f'{string!r} is not a valid boolean string')
+    try:
+        return _BOOL_STRINGS[string.lower()]
+    except KeyError:
+        raise ValueError(f'{string!r} is not a valid boolean string') from None
 
 
 def _parse_slice(string):
+    match = _SIMPLE_SLICE_RE.fullmatch(string)
+    if match:  # Fast path for the common "start:stop:step" with int literals.
+        return slice(*[int(group) if group is not None else None
+                       for group in match.groups()])
+
     slices = []
 
     class SliceVisitor(ast.NodeVisitor):
@@ -1108,27 +1377,35 @@ def _parse_none(string):
     raise ValueError('no string can be converted to None')
 
 
+@functools.lru_cache()
 def _is_constructible_from_str(type_):
-    try:
-        sig = signature(type_)
-        (argname, _), = sig.bind(object()).arguments.items()
-    except TypeError:  # Can be raised by signature() or Signature.bind().
-        return False
-    except ValueError:
-        # No relevant info in signature; continue below to also look in
-        # `type_.__init__`, in the case where type_ is indeed a type.
-        pass
-    else:
-        if sig.parameters[argname].annotation is str:
-            return True
-    if isinstance(type_, type):
+    takes_str = _takes_single_str(type_)
+    if takes_str is None and isinstance(type_, type):
         # signature() first checks __new__, if it is present.
         # `MethodType(type_.__init__, object())` binds the first parameter of
         # `__init__` -- similarly to `__init__.__get__(object(), type_)`, but
         # the latter can fail for types implemented in C (which may not support
         # binding arbitrary objects).
-        return _is_constructible_from_str(MethodType(type_.__init__, object()))
-    return False
+        takes_str = _takes_single_str(MethodType(type_.__init__, object()))
+    return bool(takes_str)
+
+
+def _takes_single_str(func):
+    """
+    Return whether *func* takes a single str argument, or None if its signature
+    is not conclusive (and `type_.__init__` should also be checked).
+    """
+    try:
+        sig = signature(func)
+        (argname, _), = sig.bind(object()).arguments.items()
+    except TypeError:  # Can be raised by signature() or Signature.bind().
+        return False
+    except ValueError:
+        # No relevant info in signature.
+        return None
+    if sig.parameters[argname].annotation is str:
+        return True
+    return None
 
 
 # _make_{enum,literal}_parser raise ArgumentTypeError so that the error message
@@ -1138,54 +1415,104 @@ def _is_constructible_from_str(type_):
 # "argument x: invalid {type} value: '{value}'".
 
 
-def _make_enum_parser(enum, value=None):
-    if value is None:
-        return functools.partial(_make_enum_parser, enum)
-    try:
-        return enum[value]
-    except KeyError:
-        raise ArgumentTypeError(
-            'invalid choice: {!r} (choose from {})'.format(
-                value, ', '.join(map(repr, enum.__members__))))
-
+def _make_enum_parser(enum):
+    members = dict(enum.__members__)
+    choices = ', '.join(map(repr, members))
 
-def _make_literal_parser(literal, parsers, value=None):
-    if value is None:
-        return functools.partial(_make_literal_parser, literal, parsers)
-    for arg, parser in zip(_ti_get_args(literal), parsers):
+    def parse(value):
         try:
-            if parser(value) == arg:
-                return arg
-        except (ValueError, ArgumentTypeError):
-            pass
-    raise ArgumentTypeError(
-        'invalid choice: {!r} (choose from {})'.format(
-            value, ', '.join(
-                map(repr, _PseudoChoices(_ti_get_args(literal))))))
+            return members[value]
+        except KeyError:
+            raise ArgumentTypeError(
+                f'invalid choice: {value!r} (choose from {choices})')
 
+    parse._defopt_enum = enum
+    return parse
 
-def _make_union_parser(union, parsers, value=None):
-    if value is None:
-        return functools.partial(_make_union_parser, union, parsers)
-    suppressed = []
-    for parser in parsers:
-        try:
-            return parser(value)
-        # See ArgumentParser._get_value.
-        except (TypeError, ValueError, ArgumentTypeError) as exc:
-            suppressed.append((parser, exc))
-    _report_suppressed_exceptions(suppressed)
-    raise ValueError(f'{value} could not be parsed as any of {union}')
+
+def _make_literal_parser(literal, parsers):
+    args = _ti_get_args(literal)
+    args_and_parsers = tuple(zip(args, parsers))
+    choices = ', '.join(map(repr, _PseudoChoices(args)))
+
+    arg_types = {type(arg) for arg in args}
+    if (len(arg_types) == 1
+            and arg_types <= {str, int}
+            and all(_unwrap_trivial_partial(parser) in arg_types
+                    for parser in parsers)):
+        # Common case of e.g. Literal["foo", "bar"] with the default parsers:
+        # parse the value once and look it up.
+        parser = parsers[0]
+        values = frozenset(args)
+
+        def parse(value):
+            try:
+                parsed = parser(value)
+            except ValueError:
+                pass
+            else:
+                if parsed in values:
+                    return parsed
+            raise ArgumentTypeError(
+                f'invalid choice: {value!r} (choose from {choices})')
+
+    else:
+        def parse(value):
+            for arg, parser in args_and_parsers:
+                try:
+                    if parser(value) == arg:
+                        return arg
+                except (ValueError, ArgumentTypeError):
+                    pass
+            raise ArgumentTypeError(
+                f'invalid choice: {value!r} (choose from {choices})')
+
+    parse._defopt_literal = literal
+    return parse
+
+
+def _make_union_parser(union, parsers):
+    if len(parsers) == 1:
+        # e.g. Union[str, ...], as parsers are truncated after the first
+        # infaillible one.  Return a new partial, as _get_parser sets its name
+        # (partial() flattens nested partials, so calling it stays cheap).
+        return functools.partial(parsers[0])
+    # An infaillible parser can only come last (see _get_parser); it is called
+    # directly, without setting up exception handling.
+    if parsers and _is_infaillible_parser(parsers[-1]):
+        *parsers, fallback_parser = parsers
+    else:
+        fallback_parser = None
+    union_str = str(union)  # Computing the repr of typing types is not cheap.
+
+    def parse(value):
+        suppressed = []
+        for parser in parsers:
+            try:
+                return parser(value)
+            # See ArgumentParser._get_value.
+            except (TypeError, ValueError, ArgumentTypeError) as exc:
+                suppressed.append((parser, exc))
+        if fallback_parser is not None:
+            return fallback_parser(value)
+        _report_suppressed_exceptions(suppressed)
+        raise ValueError(
+            f'{value} could not be parsed as any of {union_str}')
+
+    return parse
 
 
 def _make_store_tuple_action_class(
-    tuple_type, member_types, parsers, *,
-    is_variable_length=False, with_none_parser=None,
+    tuple_type, parsers, *, is_variable_length=False, with_none_parser=None,
 ):
+    # *parsers* are the already resolved parsers for each member (only one for
+    # variable-length tuples).
     if is_variable_length:
-        parsers = itertools.repeat(_get_parser(member_types[0], parsers))
+        parser, = parsers
+        parsers = itertools.repeat(parser)
     else:
-        parsers = [_get_parser(arg, parsers) for arg in member_types]
+        parsers = tuple(parsers)
+    is_namedtuple = tuple_type is not tuple
 
     def parse(action, values):
         if with_none_parser is not None:
@@ -1200,7 +1527,8 @@ def _make_store_tuple_action_class(
             # Custom actions need to raise ArgumentError, not ValueError or
             # ArgumentTypeError.
             raise ArgumentError(action, str(exc))
-        if tuple_type is not tuple:
+        if is_namedtuple:
+            # Not _make(), which would bypass any __new__ of a subclass.
             value = tuple_type(*value)
         return value
 
@@ -1222,6 +1550,12 @@ def _report_suppressed_exceptions(suppressed):
 
 
 if __name__ == '__main__':
+    # Only needed when running as a script, so don't import it for library use.
+    try:
+        from pkgutil import resolve_name as _pkgutil_resolve_name
+    except ImportError:
+        from pkgutil_resolve_name import resolve_name as _pkgutil_resolve_name
+
     def main(argv=None):
         parser = ArgumentParser()
         parser.add_argument(
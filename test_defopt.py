@@ -587,6 +587,23 @@ class TestParsers(unittest.TestCase):
         with self.assertRaisesRegex(Exception, 'no parser.*NotConstructible'):
             defopt.run(notok, argv=["foo"])
 
+    def test_implicit_parser_attributes(self):
+        # Such types are used as parsers as is; their attributes must not be
+        # mistaken for the tags of defopt's enum and literal parsers.
+        class Weird:
+            _defopt_enum = 5
+            _defopt_literal = 'foo'
+
+            def __init__(self, s: str):
+                self.s = s
+
+        def main(*, w: Weird = None):
+            return w
+
+        self.assertEqual(defopt.run(main, argv=['--w', 'z']).s, 'z')
+        parser = defopt._create_parser(main, _options(show_types=True))
+        self.assertIn('type: Weird', parser.format_help())
+
 
 class TestFlags(unittest.TestCase):
     def test_short_flags(self):
@@ -690,10 +707,20 @@ class TestTuple(unittest.TestCase):
             :param int bar: bar
             """
             return foo
-        # Instances of the Pair class compare equal to tuples, so we compare
-        # their __str__ instead to make sure that the type is correct too.
-        self.assertEqual(str(defopt.run(main, argv=['1', '2', '3'])),
-                         str(Pair(1, '2')))
+        # Instances of the Pair class compare equal to tuples, so also check
+        # that the type is correct.
+        result = defopt.run(main, argv=['1', '2', '3'])
+        self.assertIs(type(result), Pair)
+        self.assertEqual(result, (1, '2'))
+
+    def test_namedtuple_new(self):
+        class UpperPair(Pair):
+            def __new__(cls, first, second):
+                return super().__new__(cls, first, second.upper())
+        def main(foo: UpperPair): return foo
+        result = defopt.run(main, argv=['1', 'x'])
+        self.assertIs(type(result), UpperPair)
+        self.assertEqual(result, (1, 'X'))
 
     def test_enumnamedtuple(self):
         class EnumPair(Pair, Enum):
@@ -772,6 +799,13 @@ class TestUnion(unittest.TestCase):
         with self.assertRaises(Exception):
             defopt.run(main, argv=['foo'])
 
+    def test_reordered_union(self):
+        # Reordered Unions compare equal, but must get different parsers.
+        parser = defopt._get_parser(typing.Union[Path, str], {})
+        self.assertEqual(type(parser('foo')), type(Path()))
+        parser = defopt._get_parser(typing.Union[str, Path], {})
+        self.assertEqual(type(parser('foo')), str)
+
 
 class TestOptional(unittest.TestCase):
     def test_optional_hint_list(self):
@@ -862,6 +896,13 @@ class TestLiteral(unittest.TestCase):
         with self.assertRaises(SystemExit):
             defopt.run(main, argv=['quux'])
 
+    def test_reordered_literal(self):
+        # Reordered Literals compare equal, but must get different parsers.
+        parser = defopt._get_parser(defopt.Literal[1, '1'], {})
+        self.assertEqual(type(parser('1')), int)
+        parser = defopt._get_parser(defopt.Literal['1', 1], {})
+        self.assertEqual(type(parser('1')), str)
+
 
 class TestExceptions(unittest.TestCase):
     def test_exceptions(self):
@@ -935,6 +976,71 @@ class TestDoc(unittest.TestCase):
         with self.assertRaises(ValueError):
             defopt._parse_docstring(inspect.cleandoc(doc))
 
+    def test_plain_prose(self):
+        # Plain prose skips docutils; check that it is parsed identically and
+        # that anything docutils could read as markup goes through docutils.
+        for doc, plain in [
+                ('Foo bar.', True),
+                ('Foo bar,\nbaz (quux).\n\n\nSecond paragraph!', True),
+                ("It's 100% fine/ok - isn't it?", True),
+                ('A. foo', False),  # Enumerated lists.
+                ('(a) x', False),
+                ('a) x', False),
+                ('Title\n=====\n\nText', False),
+                ('See foo_ for details', False),  # Reference.
+                ('Trailing space \nhere', False),
+                ('Some *emphasis*', False),
+                ('Definition\n  list', False),
+                ('- bullet', False),
+        ]:
+            self.assertEqual(
+                bool(defopt._PLAIN_DOCSTRING_RE.fullmatch(doc)), plain, doc)
+            if not plain:
+                continue
+            paragraphs, _, _ = defopt._parse_docstring_with_docutils(doc)
+            self.assertEqual(
+                defopt._parse_docstring(doc).doc,
+                ''.join(f'{paragraph}\n\n' for paragraph in paragraphs))
+
+    def test_plain_fields(self):
+        # Plain info fields skip docutils; markup in the summary sends the
+        # same fields through docutils, which must give the same results.
+        fields = [
+            ':param int x: The x.',
+            ':type y: list[int]',
+            ':param y: The y.',
+            ':raises ValueError: If bad.',
+            ':returns: The result.',
+            ':rtype: int',
+            ':foo bar baz: Unknown field.',
+        ]
+        plain, markup = self._plain_and_markup_docs(fields)
+        self.assertIsNotNone(defopt._parse_plain_fields(plain))
+        self.assertIsNone(defopt._parse_plain_fields(markup))
+        plain_sig = defopt._parse_docstring(plain)
+        markup_sig = defopt._parse_docstring(markup)
+        for sig in [plain_sig, markup_sig]:
+            self.assertEqual(
+                [(param.name, param.annotation, param.doc)
+                 for param in sig.parameters.values()],
+                [('x', 'int', 'The x.'), ('y', 'list[int]', 'The y.')])
+            self.assertEqual(sig.raises, ('ValueError',))
+
+    def test_plain_fields_doubles(self):
+        for fields in [
+                [':param int x: The x.', ':type x: int'],
+                [':type x: int', ':param int x: The x.'],
+                [':param x: The x.', ':param x: The other x.'],
+                [':type x: int', ':type x: str'],
+        ]:
+            for doc in self._plain_and_markup_docs(fields):
+                with self.assertRaisesRegex(ValueError, 'defined twice'):
+                    defopt._parse_docstring(doc)
+
+    def _plain_and_markup_docs(self, fields):
+        return ['\n'.join([summary, '', *fields])
+                for summary in ['Do the thing.', 'Do the *thing*.']]
+
     def test_no_doc(self):
         doc_sig = defopt._parse_docstring(None)
         self.assertEqual(doc_sig.doc, '')
@@ -1067,6 +1173,12 @@ class TestDoc(unittest.TestCase):
                 'typing.Iterable[int]', {'typing': typing}),
             typing.List[int])
 
+    def test_redefined_type(self):
+        globalns = {'Foo': int}
+        self.assertEqual(defopt._get_type_from_doc('Foo', globalns), int)
+        globalns['Foo'] = str  # e.g., redefined in a REPL.
+        self.assertEqual(defopt._get_type_from_doc('Foo', globalns), str)
+
     def test_literal_block(self):
         doc = """
         ::
@@ -1229,11 +1341,11 @@ class TestHelp(unittest.TestCase):
     def test_keyword_only_enum_percent_escape(self):
         def foo(*, bar=Choice['%']):
             """:param Choice bar:"""
-        self.assert_not_in_help('Choice', foo, 'dt')
-        self.assert_in_help('{one,two,%}', foo, 'dt')
+        for flags in ['dt', 'd']:
+            help_ = self._get_help(foo, flags)
+            self.assertNotIn('Choice', help_)
+            self.assertIn('{one,two,%}', help_)
         self.assert_not_in_help('Choice', foo, 't')
-        self.assert_not_in_help('Choice', foo, 'd')
-        self.assert_in_help('{one,two,%}', foo, 'd')
         self.assert_not_in_help('Choice', foo, '')
         # ("{one,two,%}" always shows up at least in the usage line.)
 
@@ -1275,8 +1387,9 @@ class TestHelp(unittest.TestCase):
     def test_no_interpolation(self):
         def foo(bar):
             """:param int bar: %(prog)s"""
-        self.assert_in_help('%(prog)s', foo, '')
-        self.assert_not_in_help('%%', foo, '')
+        help_ = self._get_help(foo, '')
+        self.assertIn('%(prog)s', help_)
+        self.assertNotIn('%%', help_)
 
     def test_hyperlink_plaintext(self):
         def foo():
@@ -1302,8 +1415,9 @@ class TestHelp(unittest.TestCase):
 
             .. _site: https://www.python.org/
             """
-        self.assert_in_help("This site is cool", foo, "")
-        self.assert_not_in_help("https://www.python.org/", foo, "")
+        help_ = self._get_help(foo, '')
+        self.assertIn("This site is cool", help_)
+        self.assertNotIn("https://www.python.org/", help_)
 
     def test_rst_ansi(self):
         def foo():
@@ -1324,8 +1438,9 @@ class TestHelp(unittest.TestCase):
 
             Implements BAR."""
 
-        self.assert_in_help('summary-of-foo', [foo, bar], '')
-        self.assert_not_in_help('FOO', [foo, bar], '')
+        help_ = self._get_help([foo, bar], '')
+        self.assertIn('summary-of-foo', help_)
+        self.assertNotIn('FOO', help_)
 
     def assert_in_help(self, s, funcs, flags):
         self.assertIn(s, self._get_help(funcs, flags))
@@ -1434,6 +1549,12 @@ class TestExamples(unittest.TestCase):
             booleans, ['test'])
         self.assertEqual(output, b'TEST\n')
 
+    def test_run_as_module(self):
+        # _run_example runs the examples in-process; check once that a
+        # successful run also works as `python -m examples.foo`.
+        output = self._run_example_subprocess(booleans, ['test'])
+        self.assertEqual(output, b'TEST\n')
+
     def test_choices(self):
         with self._assert_stdout('Choice.one (1)\n'):
             choices.choose_enum(choices.Choice.one)
@@ -1453,7 +1574,7 @@ class TestExamples(unittest.TestCase):
             choices, ['choose-enum', 'one', '--opt', 'two'])
         self.assertEqual(output, b'Choice.one (1)\nChoice.two (2.0)\n')
         with self.assertRaises(subprocess.CalledProcessError) as error:
-            self._run_example(choices, ['choose-enum', 'four'])
+            self._run_example_subprocess(choices, ['choose-enum', 'four'])
         self.assertIn(b'four', error.exception.output)
         self.assertIn(b'{one,two,three}', error.exception.output)
         output = self._run_example(choices, ['choose-literal', 'foo'])
@@ -1462,14 +1583,14 @@ class TestExamples(unittest.TestCase):
             choices, ['choose-literal', 'foo', '--opt', 'baz'])
         self.assertEqual(output, b'foo\nbaz\n')
         with self.assertRaises(subprocess.CalledProcessError) as error:
-            self._run_example(choices, ['choose-literal', 'baz'])
+            self._run_example_subprocess(choices, ['choose-literal', 'baz'])
         self.assertIn(b'baz', error.exception.output)
         self.assertIn(b'{foo,bar}', error.exception.output)
 
     def test_exceptions(self):
         self._run_example(exceptions, ['1'])
         with self.assertRaises(subprocess.CalledProcessError) as error:
-            self._run_example(exceptions, ['0'])
+            self._run_example_subprocess(exceptions, ['0'])
         self.assertIn(b"Don't do this!", error.exception.output)
         self.assertNotIn(b"Traceback", error.exception.output)
 
@@ -1498,7 +1619,7 @@ class TestExamples(unittest.TestCase):
         output = self._run_example(parsers, ['2015-09-13'])
         self.assertEqual(output, b'2015-09-13 00:00:00\n')
         with self.assertRaises(subprocess.CalledProcessError) as error:
-            self._run_example(parsers, ['junk'])
+            self._run_example_subprocess(parsers, ['junk'])
         self.assertIn(b'datetime', error.exception.output)
         self.assertIn(b'junk', error.exception.output)
 
@@ -1547,6 +1668,22 @@ class TestExamples(unittest.TestCase):
             self.assertEqual(file.getvalue(), s)
 
     def _run_example(self, example, argv):
+        # Run the example as a script, but in-process, to avoid paying the
+        # interpreter startup cost.  Only for successful runs: failures are
+        # checked with _run_example_subprocess, as only a real process shows
+        # exactly what the user would see (exit status, tracebacks).
+        buf = StringIO()
+        argv_orig = sys.argv
+        sys.argv = [example.__file__, *argv]
+        try:
+            with contextlib.redirect_stdout(buf), \
+                    contextlib.redirect_stderr(buf):
+                runpy.run_path(example.__file__, run_name='__main__')
+        finally:
+            sys.argv = argv_orig
+        return buf.getvalue().encode()
+
+    def _run_example_subprocess(self, example, argv):
         output = subprocess.check_output(
             [sys.executable, '-m', example.__name__] + argv,
             stderr=subprocess.STDOUT)